@@ -1,20 +1,257 @@
 import os
+import re
+import json
+import time
 import asyncio
-from typing import List, Optional
+import threading
+import hashlib
+from pathlib import Path
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Protocol, Sequence, Tuple
 from abc import ABC, abstractmethod
+from functools import lru_cache
 
+import httpx
+import numpy as np
+import tiktoken
 from openai import AsyncOpenAI
-from groq import Groq
+from groq import AsyncGroq
 from huggingface_hub import InferenceClient
 
 
+# Static instructions for blog generation. Kept byte-for-byte identical across
+# requests and sent ahead of the repository data so that providers with
+# automatic prefix caching (OpenAI caches prefixes of 1024+ tokens) can reuse it.
+_SYSTEM_PROMPT = """You are a technical blog writer. Create an engaging, informative blog post about the GitHub repository provided by the user.
+
+The user message contains the repository contents between <REPO> and </REPO> tags, packed into a single document by repomix. It starts with a summary and a directory tree, followed by the contents of each file under a header naming its path. It may be truncated, so do not assume the last file shown is the last file in the project. It may be followed by additional requirements from the user, which take priority over the defaults below.
+
+INSTRUCTIONS:
+- Write a comprehensive blog post (1500-2000 words)
+- Include clear sections: Introduction, Features, Technical Analysis, Usage Examples, Conclusion
+- Use markdown formatting with proper headers
+- Make it engaging for developers
+- Highlight key code patterns and architecture decisions
+- Include code snippets where relevant
+- Keep the tone professional but approachable
+- Focus on what makes this project unique and valuable
+
+SECTION GUIDE:
+
+Title
+- Start the post with a single level-one header (#) containing a descriptive title.
+- The title should name the project and hint at what it does or why it matters.
+- Avoid clickbait, questions, and titles longer than about twelve words.
+
+Introduction
+- Open with the problem the project solves, in terms a developer would recognise from their own work.
+- Say in one or two sentences what the project is and who it is for.
+- Mention the main language, framework, or platform so readers know immediately whether it is relevant to them.
+- Do not restate the README word for word; summarise it in your own voice.
+
+Features
+- List the most important capabilities as a short bulleted list or a series of small subsections.
+- Tie each feature to something concrete in the repository: a module, a command, a configuration option, or an API.
+- Prefer the features that make the project distinctive over generic ones every project has.
+- If the repository has optional integrations or plugins, mention them briefly.
+
+Technical Analysis
+- Describe the overall architecture: the main components, how they communicate, and where the entry points are.
+- Explain notable design decisions and the trade-offs they imply, such as sync versus async, monolith versus services, or the choice of storage.
+- Point out interesting code patterns, abstractions, or extension points, and name the files where they live.
+- Note dependencies that shape the design, and anything that looks unusual or clever.
+- Stay factual: only describe what is present in the repository data. If something is unclear, say so rather than guessing.
+
+Usage Examples
+- Show how to install or set up the project, based on the files in the repository (package manifests, Dockerfiles, setup scripts, or documentation).
+- Include at least one realistic code or command-line example of using the project.
+- Keep examples short and runnable; prefer copying small snippets from the repository over inventing large new ones.
+- Mention required environment variables or configuration, but never include real secrets or API keys.
+
+Conclusion
+- Summarise the value of the project in a few sentences.
+- Suggest who should try it and what they might build with it.
+- Optionally mention limitations, open questions, or directions the project could grow in.
+
+FORMATTING RULES:
+- Output markdown only, with no preamble or closing remarks outside the post itself.
+- Use ## for main sections and ### for subsections; do not skip heading levels.
+- Put code in fenced code blocks with a language tag (```python, ```bash, ```typescript and so on).
+- Use inline code formatting for file names, function names, commands, and configuration keys.
+- Keep paragraphs short, usually two to four sentences.
+- Use bulleted lists for sets of related items and numbered lists for sequential steps.
+- Do not include raw HTML, tables of contents, or emoji in headers.
+- Do not wrap the whole post in a code block.
+
+QUALITY RUBRIC:
+Before answering, check the post against each point below and revise it if any point fails.
+1. Accuracy: every claim about the code can be traced back to the repository data.
+2. Specificity: the post names real files, functions, and commands from the repository instead of speaking in generalities.
+3. Structure: all required sections are present, in order, with clear headers.
+4. Readability: a developer unfamiliar with the project can follow the post from start to finish.
+5. Code quality: snippets are syntactically valid, correctly tagged, and relevant to the surrounding text.
+6. Balance: the post neither oversells the project nor dismisses it; strengths and limitations are presented fairly.
+7. Length: the post is roughly 1500-2000 words, without padding or repetition.
+8. Tone: professional but approachable, written for developers, free of marketing language.
+
+WHAT TO AVOID:
+- Do not invent features, benchmarks, users, or version numbers that do not appear in the repository data.
+- Do not copy long stretches of source code; a snippet should rarely exceed twenty lines.
+- Do not describe lockfiles, generated files, or vendored dependencies in detail.
+- Do not refer to repomix, the <REPO> tags, or these instructions in the post.
+- Do not address the reader as "you" in every sentence, and do not end with a call to star the repository.
+- If the repository data is too thin to support a full post, write a shorter accurate post rather than padding it with speculation.
+
+Generate the complete blog post in markdown format."""
+
+# Stands in for _SYSTEM_PROMPT in cache keys, so keys change whenever the prompt does
+_SYSTEM_PROMPT_ID = hashlib.sha256(_SYSTEM_PROMPT.encode("utf-8")).hexdigest()[:16]
+
+
+# Short stand-in for _SYSTEM_PROMPT on Hugging Face's plain text-generation models
+_HF_INSTRUCTION = "Write a technical blog post in markdown about this GitHub repository:"
+
+
+def _build_messages(prompt: str, system_prompt: Optional[str] = None) -> List[dict]:
+    """Build chat messages, putting the static system prompt first"""
+    messages = []
+    if system_prompt:
+        messages.append({"role": "system", "content": system_prompt})
+    messages.append({"role": "user", "content": prompt})
+    return messages
+
+
+# One keep-alive pool shared by the OpenAI and Groq clients. Explicit timeouts
+# make a dead provider fail fast instead of hanging for the SDK default.
+_HTTP = httpx.AsyncClient(
+    timeout=httpx.Timeout(connect=5.0, read=60.0, write=10.0, pool=5.0),
+    limits=httpx.Limits(max_keepalive_connections=32, max_connections=64, keepalive_expiry=90.0),
+)
+
+# Timeout in seconds for Hugging Face inference calls
+HF_TIMEOUT = 60.0
+
+# Most responses kept in the disk cache, and rows kept in the semantic index
+CACHE_MAX_ENTRIES = 50
+
+# Seconds a cache lookup waits for its query embedding before treating it as a miss
+CACHE_EMBED_TIMEOUT = 2.0
+
+# Token budget for the repository data sent with each blog prompt
+REPO_TOKEN_BUDGET = 4096
+
+# Most of the budget the repomix summary and directory tree may take
+_PREAMBLE_SHARE = 0.25
+
+# Rough rate used when tiktoken is unavailable, and a generous upper bound
+# used to avoid tokenizing far more text than could ever fit
+_CHARS_PER_TOKEN = 4
+_MAX_CHARS_PER_TOKEN = 8
+
+# File headers in repomix output (markdown and XML styles)
+_FILE_HEADER = re.compile(r'^(?:## File: (?P<md>.+?)|<file path="(?P<xml>[^"]+)">)\s*$', re.MULTILINE)
+
+_LOCKFILES = {"package-lock.json", "yarn.lock", "pnpm-lock.yaml", "poetry.lock", "Pipfile.lock", "Cargo.lock", "go.sum", "composer.lock", "Gemfile.lock"}
+_BINARY_EXTENSIONS = {".png", ".jpg", ".jpeg", ".gif", ".ico", ".webp", ".bmp", ".pdf", ".zip", ".gz", ".tar", ".woff", ".woff2", ".ttf", ".eot", ".mp4", ".mp3", ".so", ".dll", ".exe", ".pyc"}
+_LOW_VALUE_EXTENSIONS = {".json", ".lock", ".map", ".svg", ".csv", ".txt", ".log"}
+_CONFIG_EXTENSIONS = {".toml", ".yaml", ".yml", ".cfg", ".ini", ".env", ".sh"}
+_SOURCE_EXTENSIONS = {".py", ".ts", ".tsx", ".js", ".jsx", ".mjs", ".go", ".rs", ".java", ".kt", ".rb", ".php", ".c", ".h", ".cpp", ".hpp", ".cs", ".swift", ".md", ".rst"}
+
+
+@lru_cache(maxsize=1)
+def _get_encoding() -> Optional["tiktoken.Encoding"]:
+    """Load the tokenizer used for trimming, or None if it can't be loaded.
+    
+    tiktoken downloads the encoding on first use unless it is already in
+    TIKTOKEN_CACHE_DIR (the Docker image bakes it in), so this can fail offline.
+    """
+    try:
+        return tiktoken.encoding_for_model("gpt-3.5-turbo")
+    except Exception as e:
+        print(f"⚠️  Couldn't load tiktoken encoding, trimming by characters instead: {e}")
+        return None
+
+
+def preload_encoding() -> None:
+    """Load the trimming tokenizer ahead of the first request"""
+    _get_encoding()
+
+
+def _score_file(path: str) -> int:
+    """Rank a file by how useful it is for describing the project (higher is better, -1 excludes it)"""
+    name = os.path.basename(path)
+    ext = os.path.splitext(name)[1].lower()
+    if ext in _BINARY_EXTENSIONS:
+        return -1
+    if name in _LOCKFILES or name.endswith((".min.js", ".min.css")) or ext in _LOW_VALUE_EXTENSIONS:
+        return 0
+    if name.lower().startswith("readme"):
+        return 4
+    if ext in _SOURCE_EXTENSIONS:
+        return 3
+    if ext in _CONFIG_EXTENSIONS or name in {"Dockerfile", "Makefile"}:
+        return 2
+    return 1
+
+
+def _rank_and_trim(repo_data: str, token_budget: int = REPO_TOKEN_BUDGET) -> str:
+    """Trim repomix output to a token budget, keeping the most useful files.
+    
+    The summary and directory tree before the first file rank first but get
+    at most _PREAMBLE_SHARE of the budget, unless no file headers are found;
+    files are then taken by score until the budget runs out. Sections are
+    only tokenized as they are reached, so a huge dump costs about as much
+    as the budget. Kept sections are returned in their original order.
+    Blocking, so call it off the loop.
+    """
+    encoding = _get_encoding()
+    if encoding is None:
+        # Without a tokenizer, count characters at a rough rate per token
+        encode, decode, budget = (lambda text: text), (lambda chunk: chunk), token_budget * _CHARS_PER_TOKEN
+    else:
+        encode, decode, budget = encoding.encode, encoding.decode, token_budget
+    # No section can use more than the whole budget, so never tokenize past this
+    max_chars = token_budget * _MAX_CHARS_PER_TOKEN
+    
+    # Split into (score, text) sections: the preamble, then one per file
+    headers = list(_FILE_HEADER.finditer(repo_data))
+    starts = [0] + [m.start() for m in headers] + [len(repo_data)]
+    scores = [5] + [_score_file(m.group("md") or m.group("xml")) for m in headers]
+    sections = [(scores[i], repo_data[starts[i]:starts[i + 1]]) for i in range(len(scores))]
+    
+    # Stable sort, so equally ranked files keep their original order
+    ranked = sorted((i for i, (score, _) in enumerate(sections) if score >= 0), key=lambda i: -sections[i][0])
+    kept = {}
+    remaining = budget
+    for i in ranked:
+        if remaining <= 0:
+            break
+        text = sections[i][1]
+        # With no file headers recognised, the "preamble" is the whole dump
+        limit = min(remaining, int(budget * _PREAMBLE_SHARE)) if i == 0 and headers else remaining
+        tokens = encode(text[:max_chars])
+        if len(tokens) <= limit and len(text) <= max_chars:
+            kept[i] = text
+        else:
+            kept[i] = decode(tokens[:limit]) + "\n... (truncated)\n"
+        remaining -= min(len(tokens), limit)
+    
+    return "".join(kept[i] for i in sorted(kept))
+
+
 class AIProvider(ABC):
     """Abstract base class for AI providers"""
     
+    # Whether responses from this provider are good enough to store in LLMCache
+    cacheable = True
+    
     @abstractmethod
-    async def generate_text(self, prompt: str, max_tokens: int = 2000) -> str:
+    async def generate_text(self, prompt: str, max_tokens: int = 2000, system_prompt: Optional[str] = None) -> str:
         pass
     
+    async def generate_text_stream(self, prompt: str, max_tokens: int = 2000, system_prompt: Optional[str] = None) -> AsyncIterator[str]:
+        """Yield generated text as it arrives. Defaults to a single chunk."""
+        yield await self.generate_text(prompt, max_tokens, system_prompt)
+    
     @property
     @abstractmethod
     def name(self) -> str:
@@ -29,8 +266,8 @@ class AIProvider(ABC):
 class OpenAIProvider(AIProvider):
     """OpenAI API provider"""
     
-    def __init__(self, api_key: str, model: str = "gpt-3.5-turbo"):
-        self.client = AsyncOpenAI(api_key=api_key)
+    def __init__(self, api_key: str, model: str = "gpt-3.5-turbo", http_client: Optional[httpx.AsyncClient] = None):
+        self.client = AsyncOpenAI(api_key=api_key, http_client=http_client)
         self._model = model
         self._name = "OpenAI"
     
@@ -42,24 +279,39 @@ class OpenAIProvider(AIProvider):
     def model(self) -> str:
         return self._model
     
-    async def generate_text(self, prompt: str, max_tokens: int = 2000) -> str:
+    async def generate_text(self, prompt: str, max_tokens: int = 2000, system_prompt: Optional[str] = None) -> str:
         try:
             response = await self.client.chat.completions.create(
                 model=self._model,
-                messages=[{"role": "user", "content": prompt}],
+                messages=_build_messages(prompt, system_prompt),
                 max_tokens=max_tokens,
                 temperature=0.7
             )
             return response.choices[0].message.content or ""
         except Exception as e:
             raise Exception(f"OpenAI API error: {str(e)}")
+    
+    async def generate_text_stream(self, prompt: str, max_tokens: int = 2000, system_prompt: Optional[str] = None) -> AsyncIterator[str]:
+        try:
+            response = await self.client.chat.completions.create(
+                model=self._model,
+                messages=_build_messages(prompt, system_prompt),
+                max_tokens=max_tokens,
+                temperature=0.7,
+                stream=True
+            )
+            async for chunk in response:
+                if chunk.choices:
+                    yield chunk.choices[0].delta.content or ""
+        except Exception as e:
+            raise Exception(f"OpenAI API error: {str(e)}")
 
 
 class GroqProvider(AIProvider):
     """Groq API provider for LLaMA models"""
     
-    def __init__(self, api_key: str, model: str = "llama-3.1-70b-versatile"):
-        self.client = Groq(api_key=api_key)
+    def __init__(self, api_key: str, model: str = "llama-3.1-70b-versatile", http_client: Optional[httpx.AsyncClient] = None):
+        self.client = AsyncGroq(api_key=api_key, http_client=http_client)
         self._model = model
         self._name = "Groq"
     
@@ -71,29 +323,42 @@ class GroqProvider(AIProvider):
     def model(self) -> str:
         return self._model
     
-    async def generate_text(self, prompt: str, max_tokens: int = 2000) -> str:
+    async def generate_text(self, prompt: str, max_tokens: int = 2000, system_prompt: Optional[str] = None) -> str:
         try:
-            # Groq doesn't have async client yet, so we run in executor
-            loop = asyncio.get_event_loop()
-            response = await loop.run_in_executor(
-                None,
-                lambda: self.client.chat.completions.create(
-                    model=self._model,
-                    messages=[{"role": "user", "content": prompt}],
-                    max_tokens=max_tokens,
-                    temperature=0.7
-                )
+            response = await self.client.chat.completions.create(
+                model=self._model,
+                messages=_build_messages(prompt, system_prompt),
+                max_tokens=max_tokens,
+                temperature=0.7
             )
             return response.choices[0].message.content or ""
         except Exception as e:
             raise Exception(f"Groq API error: {str(e)}")
+    
+    async def generate_text_stream(self, prompt: str, max_tokens: int = 2000, system_prompt: Optional[str] = None) -> AsyncIterator[str]:
+        try:
+            response = await self.client.chat.completions.create(
+                model=self._model,
+                messages=_build_messages(prompt, system_prompt),
+                max_tokens=max_tokens,
+                temperature=0.7,
+                stream=True
+            )
+            async for chunk in response:
+                if chunk.choices:
+                    yield chunk.choices[0].delta.content or ""
+        except Exception as e:
+            raise Exception(f"Groq API error: {str(e)}")
 
 
 class HuggingFaceProvider(AIProvider):
     """Hugging Face Inference API provider"""
     
+    # gpt2/distilgpt2 output is a last resort, not something to serve again
+    cacheable = False
+    
     def __init__(self, api_key: Optional[str] = None, model: str = "microsoft/DialoGPT-large"):
-        self.client = InferenceClient(token=api_key)
+        self.client = InferenceClient(token=api_key, timeout=HF_TIMEOUT)
         self._model = model
         self._name = "Hugging Face"
     
@@ -105,8 +370,14 @@ class HuggingFaceProvider(AIProvider):
     def model(self) -> str:
         return self._model
     
-    async def generate_text(self, prompt: str, max_tokens: int = 2000) -> str:
+    async def generate_text(self, prompt: str, max_tokens: int = 2000, system_prompt: Optional[str] = None) -> str:
         try:
+            # Plain completion models have no system role, and the input gets cut
+            # to 1000 characters below, so a long system prompt would push out
+            # the repository data. Use a one-line instruction instead.
+            if system_prompt:
+                prompt = f"{_HF_INSTRUCTION}\n\n{prompt}"
+            
             # Try with a free text generation model
             loop = asyncio.get_event_loop()
             
@@ -141,14 +412,299 @@ class HuggingFaceProvider(AIProvider):
         except Exception as e:
             raise Exception(f"Hugging Face API error: {str(e)}")
 
+    async def embed(self, text: str, model: str = "sentence-transformers/all-MiniLM-L6-v2") -> np.ndarray:
+        """Get a sentence embedding for the given text"""
+        loop = asyncio.get_event_loop()
+        return await loop.run_in_executor(
+            None,
+            lambda: self.client.feature_extraction(text, model=model)
+        )
+
+
+class CacheBackend(Protocol):
+    """Storage interface used by LLMCache"""
+
+    def get(self, key: str) -> Optional[str]:
+        ...
+
+    def set(self, key: str, value: str) -> None:
+        ...
+
+
+class DiskCacheBackend:
+    """Stores cached responses as markdown files on disk.
+
+    Files are kept in least-recently-used order by mtime: hits touch the
+    file, and writes evict the oldest beyond max_entries.
+    """
+
+    def __init__(self, cache_dir: Path = Path("data/cache"), max_entries: int = CACHE_MAX_ENTRIES):
+        self.cache_dir = cache_dir
+        self.max_entries = max_entries
+        self.cache_dir.mkdir(parents=True, exist_ok=True)
+
+    def get(self, key: str) -> Optional[str]:
+        path = self.cache_dir / f"{key}.md"
+        try:
+            value = path.read_text(encoding="utf-8")
+            path.touch()
+            return value
+        except FileNotFoundError:
+            return None
+
+    def set(self, key: str, value: str) -> None:
+        (self.cache_dir / f"{key}.md").write_text(value, encoding="utf-8")
+        self._prune()
+
+    def _prune(self) -> None:
+        entries = sorted(self.cache_dir.glob("*.md"), key=lambda p: p.stat().st_mtime, reverse=True)
+        for stale in entries[self.max_entries:]:
+            stale.unlink(missing_ok=True)
+
+
+class LLMCache:
+    """Two-tier response cache: exact prompt match, then semantic match.
+
+    The semantic tier only compares entries within the same bucket (same
+    model and repository data), so a reworded custom prompt for a repo we
+    already wrote about can reuse the earlier blog.
+    """
+
+    def __init__(
+        self,
+        backend: Optional[CacheBackend] = None,
+        embedder: Optional[Callable[[str], Awaitable[np.ndarray]]] = None,
+        similarity_threshold: float = 0.92,
+        cache_dir: Path = Path("data/cache"),
+    ):
+        self.backend = backend or DiskCacheBackend(cache_dir)
+        self.embedder = embedder
+        self.similarity_threshold = similarity_threshold
+        self._vectors_path = cache_dir / "embeddings.npy"
+        self._index_path = cache_dir / "embeddings.json"
+        self._vectors: Optional[np.ndarray] = None
+        self._index: List[dict] = []
+        self._save_lock = asyncio.Lock()
+        self._background: set = set()
+        self._load_vectors()
+
+    @staticmethod
+    def make_key(model: str, prompt: str) -> str:
+        """Exact-match key for a model/prompt pair"""
+        payload = json.dumps({"model": model, "prompt": prompt}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    @staticmethod
+    def make_bucket(model: str, repo_data: str) -> str:
+        """Group key for semantic lookups"""
+        payload = json.dumps({"model": model, "repo_data": repo_data}, sort_keys=True)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _load_vectors(self):
+        if self._vectors_path.exists() and self._index_path.exists():
+            try:
+                vectors = np.load(self._vectors_path)
+                index = json.loads(self._index_path.read_text(encoding="utf-8"))
+                # The two files are written one after the other, so a crash in
+                # between leaves them out of step; rows would map to wrong keys
+                if vectors.ndim != 2 or len(index) != vectors.shape[0]:
+                    raise ValueError(f"{len(index)} index entries for {vectors.shape[0] if vectors.ndim else 0} vectors")
+                self._vectors, self._index = vectors, index
+            except Exception as e:
+                print(f"⚠️  Discarding unreadable semantic cache: {e}")
+                self._vectors, self._index = None, []
+                self._vectors_path.unlink(missing_ok=True)
+                self._index_path.unlink(missing_ok=True)
+
+    def _save_vectors(self, vectors: np.ndarray, index: List[dict]):
+        np.save(self._vectors_path, vectors)
+        self._index_path.write_text(json.dumps(index), encoding="utf-8")
+
+    async def _embed(self, text: str, timeout: Optional[float] = None) -> Optional[np.ndarray]:
+        if self.embedder is None or not text.strip():
+            return None
+        try:
+            vector = np.asarray(await asyncio.wait_for(self.embedder(text), timeout), dtype=np.float32)
+            # Some models return one vector per token; mean-pool those
+            if vector.ndim > 1:
+                vector = vector.reshape(-1, vector.shape[-1]).mean(axis=0)
+            norm = np.linalg.norm(vector)
+            return vector / norm if norm else None
+        except asyncio.TimeoutError:
+            print(f"⚠️  Embedding took over {timeout}s, skipping semantic cache")
+            return None
+        except Exception as e:
+            print(f"⚠️  Embedding failed, skipping semantic cache: {e}")
+            return None
+
+    async def get(self, keys: Sequence[str], buckets: Sequence[str] = (), query: str = "") -> Optional[str]:
+        """Look up a cached response by exact key, then by semantic similarity.
+        
+        Keys are tried in order, so callers list them by preference.
+        """
+        for key in keys:
+            cached = await asyncio.to_thread(self.backend.get, key)
+            if cached is not None:
+                print("⚡ Exact cache hit")
+                return cached
+
+        if self._vectors is None or not buckets or not query:
+            return None
+
+        # The semantic tier is best-effort: any problem is just a cache miss
+        try:
+            return await self._semantic_get(buckets, query)
+        except Exception as e:
+            print(f"⚠️  Semantic cache lookup failed, treating as a miss: {e}")
+            return None
+
+    async def _semantic_get(self, buckets: Sequence[str], query: str) -> Optional[str]:
+        # Snapshot both together, since background stores replace them while we await
+        vectors, index = self._vectors, self._index
+        wanted = set(buckets)
+        rows = [i for i, entry in enumerate(index) if entry["bucket"] in wanted]
+        if not rows:
+            return None
+
+        # Don't hold up generation on a slow embedding endpoint
+        vector = await self._embed(query, timeout=CACHE_EMBED_TIMEOUT)
+        if vector is None or vector.shape[0] != vectors.shape[1]:
+            return None
+
+        scores = np.dot(vectors[rows], vector)
+        best = int(np.argmax(scores))
+        if scores[best] > self.similarity_threshold:
+            print(f"⚡ Semantic cache hit (similarity {scores[best]:.3f})")
+            return await asyncio.to_thread(self.backend.get, index[rows[best]]["key"])
+        return None
+
+    async def set(self, key: str, value: str, bucket: str = "", query: str = "") -> None:
+        """Store a response. Its query embedding is stored in the background,
+        so callers don't wait on the embedding request."""
+        await asyncio.to_thread(self.backend.set, key, value)
+
+        if not bucket or not query:
+            return
+        task = asyncio.create_task(self._store_vector(key, bucket, query))
+        self._background.add(task)
+        task.add_done_callback(self._background.discard)
+
+    async def _store_vector(self, key: str, bucket: str, query: str) -> None:
+        vector = await self._embed(query)
+        if vector is None:
+            return
+        if self._vectors is None:
+            self._vectors = vector[np.newaxis, :]
+        elif vector.shape[0] == self._vectors.shape[1]:
+            self._vectors = np.vstack([self._vectors, vector])
+        else:
+            return
+        self._index = self._index + [{"bucket": bucket, "key": key}]
+        # Drop the oldest rows in step with the disk cache's eviction; this
+        # also bounds the cost of rewriting the whole file on every store
+        if len(self._index) > CACHE_MAX_ENTRIES:
+            self._vectors = self._vectors[-CACHE_MAX_ENTRIES:]
+            self._index = self._index[-CACHE_MAX_ENTRIES:]
+        
+        # Save a snapshot, so later updates can't change it mid-write
+        async with self._save_lock:
+            try:
+                await asyncio.to_thread(self._save_vectors, self._vectors, self._index)
+            except Exception as e:
+                print(f"⚠️  Failed to save semantic cache: {e}")
+
 
 class MultiProviderAI:
     """Multi-provider AI system with automatic fallback"""
     
+    # Skip a provider for BREAKER_COOLDOWN seconds after this many failures in a row
+    BREAKER_THRESHOLD = 5
+    BREAKER_COOLDOWN = 60.0
+    
     def __init__(self):
         self.providers: List[AIProvider] = []
-        self.current_provider_index = 0
+        # Cap in-flight requests per provider to stay under rate limits
+        self._semaphores: Dict[str, asyncio.Semaphore] = {
+            "Groq": asyncio.Semaphore(8),
+            "OpenAI": asyncio.Semaphore(4),
+            "Hugging Face": asyncio.Semaphore(2),
+        }
         self._setup_providers()
+        self._breaker: Dict[str, dict] = {
+            p.name: {"failures": 0, "opened_at": 0.0, "probing": False, "probe_started": 0.0}
+            for p in self.providers
+        }
+        self.cache = LLMCache(embedder=self._get_embedder())
+    
+    def _is_circuit_open(self, provider: AIProvider) -> bool:
+        """Check whether a provider should be skipped after repeated failures.
+        
+        Errors and too-short replies both count as failures. Providers are
+        always tried in preference order, so this is what routes calls
+        around a provider that keeps failing.
+        
+        Once the cooldown passes the circuit is half-open: exactly one caller
+        gets through as a probe, and everyone else keeps skipping the provider
+        until that probe succeeds or fails. A probe that never reports back
+        (e.g. a cancelled request) is given up on after another cooldown.
+        """
+        state = self._breaker[provider.name]
+        if state["failures"] < self.BREAKER_THRESHOLD:
+            return False
+        now = time.monotonic()
+        if now - state["opened_at"] < self.BREAKER_COOLDOWN:
+            return True
+        if state["probing"] and now - state["probe_started"] < self.BREAKER_COOLDOWN:
+            return True
+        state["probing"] = True
+        state["probe_started"] = now
+        return False
+    
+    def _all_failed_error(self, last_error: Optional[Exception]) -> Exception:
+        if last_error is None:
+            # Nothing was tried because every circuit is open
+            return Exception("All AI providers failed recently and are cooling down. Try again in a minute.")
+        return Exception(f"All AI providers failed. Last error: {last_error}")
+    
+    def _record_failure(self, provider: AIProvider):
+        state = self._breaker[provider.name]
+        state["failures"] += 1
+        state["opened_at"] = time.monotonic()
+        state["probing"] = False
+    
+    def _record_success(self, provider: AIProvider):
+        state = self._breaker[provider.name]
+        state["failures"] = 0
+        state["opened_at"] = 0.0
+        state["probing"] = False
+    
+    @staticmethod
+    def _cache_key(provider: AIProvider, prompt: str, repo_data: str) -> Tuple[str, str]:
+        """Exact key and semantic bucket for a response from the given provider"""
+        model = f"{provider.name} ({provider.model})"
+        return LLMCache.make_key(model, _SYSTEM_PROMPT_ID + prompt), LLMCache.make_bucket(model, repo_data)
+    
+    async def _cache_lookup(self, prompt: str, repo_data: str, custom_prompt: str) -> Optional[str]:
+        """Check the cache for a response from any cacheable provider, in preference order"""
+        entries = [self._cache_key(p, prompt, repo_data) for p in self.providers if p.cacheable]
+        if not entries:
+            return None
+        keys, buckets = zip(*entries)
+        return await self.cache.get(keys, buckets, custom_prompt)
+    
+    async def _cache_store(self, provider: AIProvider, prompt: str, repo_data: str, custom_prompt: str, result: str):
+        """Cache a response under the provider that actually produced it"""
+        if not provider.cacheable:
+            return
+        key, bucket = self._cache_key(provider, prompt, repo_data)
+        await self.cache.set(key, result, bucket, custom_prompt)
+    
+    def _get_embedder(self) -> Optional[Callable[[str], Awaitable[np.ndarray]]]:
+        """Use the Hugging Face provider for embeddings when it is available"""
+        for provider in self.providers:
+            if isinstance(provider, HuggingFaceProvider):
+                return provider.embed
+        return None
     
     def _setup_providers(self):
         """Initialize available AI providers based on environment variables"""
@@ -156,14 +712,14 @@ class MultiProviderAI:
         # Add Groq if API key exists (recommended - fast and free)
         if os.getenv("GROQ_API_KEY"):
             try:
-                self.providers.append(GroqProvider(os.getenv("GROQ_API_KEY")))
+                self.providers.append(GroqProvider(os.getenv("GROQ_API_KEY"), http_client=_HTTP))
             except Exception as e:
                 print(f"Failed to initialize Groq provider: {e}")
         
         # Add OpenAI if API key exists
         if os.getenv("OPENAI_API_KEY"):
             try:
-                self.providers.append(OpenAIProvider(os.getenv("OPENAI_API_KEY")))
+                self.providers.append(OpenAIProvider(os.getenv("OPENAI_API_KEY"), http_client=_HTTP))
             except Exception as e:
                 print(f"Failed to initialize OpenAI provider: {e}")
         
@@ -173,72 +729,186 @@ class MultiProviderAI:
         except Exception as e:
             print(f"Failed to initialize Hugging Face provider: {e}")
     
-    async def generate_text(self, prompt: str, max_tokens: int = 2000) -> str:
+    async def generate_text(self, prompt: str, max_tokens: int = 2000, system_prompt: Optional[str] = None) -> str:
         """Generate text using available providers with fallback"""
+        result, _ = await self._generate_text(prompt, max_tokens, system_prompt)
+        return result
+    
+    async def _generate_text(self, prompt: str, max_tokens: int = 2000, system_prompt: Optional[str] = None) -> Tuple[str, AIProvider]:
+        """Like generate_text, but also returns the provider that answered"""
         if not self.providers:
             raise Exception("No AI providers available")
         
         last_error = None
         
-        # Try each provider
-        for attempt in range(len(self.providers)):
-            provider = self.providers[self.current_provider_index]
+        # Try each provider in preference order, every call
+        for provider in self.providers:
+            
+            if self._is_circuit_open(provider):
+                print(f"⏭️  Skipping {provider.name}, circuit open after repeated failures")
+                continue
             
             try:
                 print(f"🤖 Trying {provider.name} ({provider.model})...")
-                result = await provider.generate_text(prompt, max_tokens)
+                async with self._semaphores[provider.name]:
+                    result = await provider.generate_text(prompt, max_tokens, system_prompt)
                 
                 if result and len(result.strip()) > 50:
+                    self._record_success(provider)
                     print(f"✅ Successfully generated text with {provider.name}")
-                    return result
+                    return result, provider
                 else:
                     print(f"⚠️  {provider.name} returned insufficient content")
+                    last_error = Exception(f"{provider.name} returned insufficient content")
+                    self._record_failure(provider)
                     
             except Exception as e:
                 print(f"❌ {provider.name} failed: {str(e)}")
                 last_error = e
-                
-            # Move to next provider
-            self.current_provider_index = (self.current_provider_index + 1) % len(self.providers)
+                self._record_failure(provider)
         
-        raise Exception(f"All AI providers failed. Last error: {last_error}")
+        raise self._all_failed_error(last_error)
     
     async def generate_blog(self, repo_data: str, custom_prompt: str = "") -> str:
         """Generate a complete blog post from repository data"""
+        repo_data = await asyncio.to_thread(_rank_and_trim, repo_data)
         prompt = self._build_blog_prompt(repo_data, custom_prompt)
-        return await self.generate_text(prompt, max_tokens=4000)
+        
+        cached = await self._cache_lookup(prompt, repo_data, custom_prompt)
+        if cached is not None:
+            return cached
+        
+        result, provider = await self._generate_text(prompt, max_tokens=4000, system_prompt=_SYSTEM_PROMPT)
+        await self._cache_store(provider, prompt, repo_data, custom_prompt, result)
+        return result
+    
+    async def generate_batch(self, prompts: List[str], max_tokens: int = 2000, system_prompt: Optional[str] = None) -> List[str]:
+        """Generate text for several independent prompts concurrently"""
+        return await asyncio.gather(*[self.generate_text(p, max_tokens, system_prompt) for p in prompts])
+    
+    async def generate_text_stream(self, prompt: str, max_tokens: int = 2000, system_prompt: Optional[str] = None) -> AsyncIterator[str]:
+        """Stream text from available providers with fallback.
+        
+        Output is held back until it passes the same length check as
+        generate_text, so a provider with a too-short reply is skipped. Falls
+        back to the next provider only if nothing has been yielded yet; once
+        tokens have gone out, a failure is raised to the caller.
+        """
+        async for _, token in self._generate_text_stream(prompt, max_tokens, system_prompt):
+            yield token
+    
+    async def _generate_text_stream(self, prompt: str, max_tokens: int = 2000, system_prompt: Optional[str] = None) -> AsyncIterator[Tuple[AIProvider, str]]:
+        """Like generate_text_stream, but yields (provider, token) pairs"""
+        if not self.providers:
+            raise Exception("No AI providers available")
+        
+        last_error = None
+        
+        # Try each provider in preference order, every call
+        for provider in self.providers:
+            yielded = False
+            buffered: List[str] = []
+            
+            if self._is_circuit_open(provider):
+                print(f"⏭️  Skipping {provider.name}, circuit open after repeated failures")
+                continue
+            
+            try:
+                print(f"🤖 Streaming from {provider.name} ({provider.model})...")
+                async with self._semaphores[provider.name]:
+                    async for token in provider.generate_text_stream(prompt, max_tokens, system_prompt):
+                        if not token:
+                            continue
+                        if yielded:
+                            yield provider, token
+                            continue
+                        buffered.append(token)
+                        if len("".join(buffered).strip()) > 50:
+                            yielded = True
+                            yield provider, "".join(buffered)
+                
+                if yielded:
+                    self._record_success(provider)
+                    print(f"✅ Successfully streamed text with {provider.name}")
+                    return
+                print(f"⚠️  {provider.name} returned insufficient content")
+                last_error = Exception(f"{provider.name} returned insufficient content")
+                self._record_failure(provider)
+                
+            except Exception as e:
+                self._record_failure(provider)
+                if yielded:
+                    raise
+                print(f"❌ {provider.name} failed: {str(e)}")
+                last_error = e
+        
+        raise self._all_failed_error(last_error)
+    
+    async def generate_blog_stream(self, repo_data: str, custom_prompt: str = "") -> AsyncIterator[Tuple[str, str]]:
+        """Stream a complete blog post from repository data.
+        
+        Yields (source, text) pairs, where source is the provider that wrote
+        the post, e.g. "Groq (llama-3.1-70b-versatile)", or "cache".
+        """
+        repo_data = await asyncio.to_thread(_rank_and_trim, repo_data)
+        prompt = self._build_blog_prompt(repo_data, custom_prompt)
+        
+        cached = await self._cache_lookup(prompt, repo_data, custom_prompt)
+        if cached is not None:
+            yield "cache", cached
+            return
+        
+        chunks = []
+        provider = None
+        async for provider, token in self._generate_text_stream(prompt, max_tokens=4000, system_prompt=_SYSTEM_PROMPT):
+            chunks.append(token)
+            yield f"{provider.name} ({provider.model})", token
+        if provider is not None:
+            await self._cache_store(provider, prompt, repo_data, custom_prompt, "".join(chunks))
     
     def _build_blog_prompt(self, repo_data: str, custom_prompt: str = "") -> str:
-        """Build optimized prompt for blog generation"""
-        base_prompt = f"""
-You are a technical blog writer. Create an engaging, informative blog post about this GitHub repository.
-
-REPOSITORY DATA:
-{repo_data[:15000]}  # Limit to prevent token overflow
-
-INSTRUCTIONS:
-- Write a comprehensive blog post (1500-2000 words)
-- Include clear sections: Introduction, Features, Technical Analysis, Usage Examples, Conclusion
-- Use markdown formatting with proper headers
-- Make it engaging for developers
-- Highlight key code patterns and architecture decisions
-- Include code snippets where relevant
-- Keep the tone professional but approachable
-- Focus on what makes this project unique and valuable
-
-{f"ADDITIONAL REQUIREMENTS: {custom_prompt}" if custom_prompt else ""}
-
-Generate the complete blog post in markdown format:
-"""
-        return base_prompt
+        """Build the per-request part of the blog prompt.
+        
+        The static instructions live in _SYSTEM_PROMPT and are sent first, so
+        providers with prefix caching can reuse them across requests.
+        """
+        parts = ["<REPO>\n", repo_data, "\n</REPO>"]
+        if custom_prompt:
+            parts.append(f"\n\nADDITIONAL REQUIREMENTS: {custom_prompt}")
+        return "".join(parts)
+    
+    async def warmup(self):
+        """Open pooled connections to the provider APIs before the first request"""
+        urls = {str(p.client.base_url) for p in self.providers if isinstance(p, (OpenAIProvider, GroqProvider))}
+        results = await asyncio.gather(*[_HTTP.head(url) for url in urls], return_exceptions=True)
+        for url, result in zip(urls, results):
+            if isinstance(result, Exception):
+                print(f"⚠️  Warmup request to {url} failed: {result}")
     
     def get_available_providers(self) -> List[str]:
         """Get list of available provider names"""
         return [f"{p.name} ({p.model})" for p in self.providers]
     
     def get_current_provider(self) -> str:
-        """Get current provider name"""
+        """Get the name of the preferred provider (tried first on every call)"""
         if self.providers:
-            provider = self.providers[self.current_provider_index]
+            provider = self.providers[0]
             return f"{provider.name} ({provider.model})"
         return "None"
+
+
+_ai_singleton: Optional[MultiProviderAI] = None
+_ai_singleton_lock = threading.Lock()
+
+
+def get_ai() -> MultiProviderAI:
+    """Get the shared MultiProviderAI instance, creating it on first use.
+    
+    Safe to call from worker threads (e.g. via asyncio.to_thread).
+    """
+    global _ai_singleton
+    if _ai_singleton is None:
+        with _ai_singleton_lock:
+            if _ai_singleton is None:
+                _ai_singleton = MultiProviderAI()
+    return _ai_singleton
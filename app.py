@@ -1,12 +1,12 @@
 import os
 import asyncio
 import json
+import secrets
 import subprocess
 from pathlib import Path
 from typing import Optional, Dict, Any, List
-from datetime import datetime
+from collections import OrderedDict
 
-import aiofiles
 from fastapi import FastAPI, HTTPException, Request
 from fastapi.responses import HTMLResponse
 from fastapi.middleware.cors import CORSMiddleware
@@ -14,8 +14,8 @@ import socketio
 import uvicorn
 from dotenv import load_dotenv
 
-from ai_providers import MultiProviderAI
-from utils import process_remote_repo
+from ai_providers import get_ai, preload_encoding
+from utils import process_remote_repo, ensure_repomix
 
 # Load environment stuff
 load_dotenv()
@@ -55,12 +55,29 @@ sio = socketio.AsyncServer(
 )
 socket_app = socketio.ASGIApp(sio, app)
 
-# Keep track of who's doing what
-active_sessions: Dict[str, Dict] = {}
+# Keep track of who's doing what (oldest sessions get dropped past the limit)
+MAX_ACTIVE_SESSIONS = 128
+active_sessions: "OrderedDict[str, Dict]" = OrderedDict()
 
-# Make sure our folders exist
-os.makedirs("data/repos", exist_ok=True)
-os.makedirs("data/blogs", exist_ok=True)
+@app.on_event("startup")
+async def _startup():
+    """Create data folders, check repomix and warm up the AI providers before the first request"""
+    # Make sure our folders exist
+    await asyncio.to_thread(os.makedirs, "data/repos", exist_ok=True)
+    await asyncio.to_thread(os.makedirs, "data/blogs", exist_ok=True)
+    
+    # Check for repomix once here instead of on every request
+    try:
+        await ensure_repomix()
+        app.state.repomix_ready = True
+    except Exception as e:
+        print(f"⚠️  {e}")
+        app.state.repomix_ready = False
+    
+    await asyncio.to_thread(preload_encoding)
+    
+    ai = await asyncio.to_thread(get_ai)
+    await ai.warmup()
 
 @app.post("/api/generate")
 async def generate_blog(request: Request):
@@ -70,15 +87,23 @@ async def generate_blog(request: Request):
     repo_name = data.get("repoName", "").strip()
     ignore_files = data.get("ignoreFiles", "")
     custom_prompt = data.get("customPrompt", "")
+    socket_id = data.get("socketId") or None
     
     if not repo_url or not repo_name:
         raise HTTPException(status_code=400, detail="Repository URL and name are required")
     
+    # Checked once at startup, see _startup()
+    if not getattr(app.state, "repomix_ready", False):
+        raise HTTPException(
+            status_code=503,
+            detail="repomix isn't available on the server. Install it with: npm install -g repomix"
+        )
+    
     # Generate session ID
-    session_id = f"session_{datetime.now().strftime('%Y%m%d_%H%M%S')}"
+    session_id = f"session_{secrets.token_hex(8)}"
     
     # Make sure we have at least one AI provider working
-    ai_providers = MultiProviderAI()
+    ai_providers = get_ai()
     available_providers = ai_providers.get_available_providers()
     
     if not available_providers:
@@ -88,23 +113,37 @@ async def generate_blog(request: Request):
         )
     
     # Start the magic in the background
-    asyncio.create_task(generate_blog_async(session_id, repo_url, repo_name, ignore_files, custom_prompt))
+    asyncio.create_task(generate_blog_async(session_id, repo_url, repo_name, ignore_files, custom_prompt, socket_id))
     
     return {"sessionId": session_id, "status": "started", "availableProviders": available_providers}
 
-async def generate_blog_async(session_id: str, repo_url: str, repo_name: str, ignore_files: str = "", custom_prompt: str = ""):
-    """Generate blog in the background with live updates"""
+async def _flush_emits(pending_emits: List[asyncio.Task]):
+    """Wait for fired-off emits, logging any that failed"""
+    results = await asyncio.gather(*pending_emits, return_exceptions=True)
+    for result in results:
+        if isinstance(result, Exception):
+            print(f"⚠️  Failed to send update to client: {result}")
+    pending_emits.clear()
+
+async def generate_blog_async(session_id: str, repo_url: str, repo_name: str, ignore_files: str = "", custom_prompt: str = "", socket_id: Optional[str] = None):
+    """Generate blog in the background with live updates.
+    
+    Updates go only to socket_id when the client sent one, otherwise to everyone.
+    """
+    # Progress and token emits are fired without waiting on the client; they are
+    # all awaited before the final 'completed' event so it always arrives last
+    pending_emits: List[asyncio.Task] = []
+    
     try:
-        # Get our AI ready
-        ai_providers = MultiProviderAI()
-        active_sessions[session_id] = {"providers": ai_providers, "progress": []}
+        # Get our AI ready while the repo is being processed
+        ai_task = asyncio.create_task(asyncio.to_thread(get_ai))
         
         # Step 1: Check out the repo
-        await sio.emit('progress', {
+        pending_emits.append(asyncio.create_task(sio.emit('progress', {
             'sessionId': session_id,
             'step': 'repository-analysis', 
             'message': '📦 Checking out the repo...'
-        })
+        }, to=socket_id)))
         
         # Process the repository
         normalized_name = repo_name.lower().replace(' ', '-').replace('_', '-')
@@ -112,27 +151,41 @@ async def generate_blog_async(session_id: str, repo_url: str, repo_name: str, ig
         
         await process_remote_repo(repo_url, repo_data_path, ignore_files)
         
-        # Read what we got
-        async with aiofiles.open(repo_data_path, "r") as f:
-            repo_data = await f.read()
+        ai_providers = await ai_task
+        active_sessions[session_id] = {"providers": ai_providers, "progress": []}
+        while len(active_sessions) > MAX_ACTIVE_SESSIONS:
+            active_sessions.popitem(last=False)
         
-        # Step 2: AI time!
+        # Step 2: AI time! (tell the client while we read the repo data)
         providers_info = ai_providers.get_available_providers()
-        await sio.emit('progress', {
+        pending_emits.append(asyncio.create_task(sio.emit('progress', {
             'sessionId': session_id,
             'step': 'ai-analysis',
             'message': f'🤖 Using FREE AI models! Available: {", ".join(providers_info)}'
-        })
+        }, to=socket_id)))
+        repo_data = await asyncio.to_thread(repo_data_path.read_text, encoding='utf-8')
         
-        # Generate blog content
-        blog_content = await ai_providers.generate_blog(repo_data, custom_prompt)
+        if session_id in active_sessions:
+            active_sessions.move_to_end(session_id)
+        
+        # Generate blog content, streaming tokens to the client as they arrive
+        chunks = []
+        source = None
+        async for source, token in ai_providers.generate_blog_stream(repo_data, custom_prompt):
+            chunks.append(token)
+            pending_emits.append(asyncio.create_task(sio.emit('token', {'sessionId': session_id, 'delta': token}, to=socket_id)))
+        blog_content = "".join(chunks)
         
         # Save blog
         blog_path = Path(f"data/blogs/{normalized_name}.md")
-        async with aiofiles.open(blog_path, "w") as f:
-            await f.write(blog_content)
+        await asyncio.to_thread(blog_path.write_text, blog_content, 'utf-8')
         
         # Success
+        if source == "cache":
+            generation_details = 'Blog served from cache'
+        else:
+            generation_details = f'Blog generated with {source}'
+        await _flush_emits(pending_emits)
         await sio.emit('progress', {
             'sessionId': session_id,
             'step': 'completed',
@@ -140,9 +193,9 @@ async def generate_blog_async(session_id: str, repo_url: str, repo_name: str, ig
             'blogContent': blog_content,
             'workflow': [
                 {'step': 'repository-analysis', 'status': 'completed', 'details': 'Repository analyzed successfully'},
-                {'step': 'ai-generation', 'status': 'completed', 'details': f'Blog generated with {ai_providers.get_current_provider()}'}
+                {'step': 'ai-generation', 'status': 'completed', 'details': generation_details}
             ]
-        })
+        }, to=socket_id)
         
     except Exception as error:
         error_msg = str(error)
@@ -152,9 +205,9 @@ async def generate_blog_async(session_id: str, repo_url: str, repo_name: str, ig
         normalized_name = repo_name.lower().replace(' ', '-').replace('_', '-')
         blog_path = Path(f"data/blogs/{normalized_name}.md")
         
-        async with aiofiles.open(blog_path, "w") as f:
-            await f.write(template_blog)
+        await asyncio.to_thread(blog_path.write_text, template_blog, 'utf-8')
         
+        await _flush_emits(pending_emits)
         await sio.emit('progress', {
             'sessionId': session_id,
             'step': 'completed',
@@ -165,7 +218,11 @@ async def generate_blog_async(session_id: str, repo_url: str, repo_name: str, ig
                 {'step': 'ai-generation', 'status': 'failed', 'details': f'AI providers failed: {error_msg}'},
                 {'step': 'template-generation', 'status': 'completed', 'details': 'Generated basic template as fallback'}
             ]
-        })
+        }, to=socket_id)
+    
+    finally:
+        # Session is done either way, no need to hold on to it
+        active_sessions.pop(session_id, None)
 
 def generate_template_blog(repo_name: str) -> str:
     """Generate a basic template blog when AI fails"""
@@ -211,7 +268,7 @@ if __name__ == "__main__":
     port = int(os.getenv("PORT", 3001))
     print(f"🚀 AI Blog Generator starting on http://localhost:{port}")
     try:
-        providers = MultiProviderAI().get_available_providers()
+        providers = get_ai().get_available_providers()
         print(f"🔑 AI Providers available: {providers}")
     except:
         print("⚠️  No AI providers configured. Add API keys to .env file.")
@@ -1,6 +1,6 @@
 'use client'
 
-import { useState, useEffect } from 'react'
+import { useState, useEffect, useRef } from 'react'
 import { motion, AnimatePresence } from 'framer-motion'
 import { Github, Sparkles, FileText, Loader, CheckCircle, Rocket, Zap, Code2, BookOpen, Stars } from 'lucide-react'
 import { io, Socket } from 'socket.io-client'
@@ -18,6 +18,11 @@ interface ProgressUpdate {
   workflow?: Array<{ step: string; status: string; details: string }>
 }
 
+interface TokenUpdate {
+  sessionId: string
+  delta: string
+}
+
 // Floating particles component for background animation
 const FloatingParticles = () => {
   const [particles, setParticles] = useState<Array<{
@@ -126,6 +131,8 @@ export default function Home() {
   const [progress, setProgress] = useState<ProgressUpdate[]>([])
   const [blogContent, setBlogContent] = useState('')
   const [currentStep, setCurrentStep] = useState('')
+  // Session we started, so we only show our own streamed tokens
+  const sessionIdRef = useRef<string | null>(null)
 
   useEffect(() => {
     // Initialize socket connection to backend on port 3001
@@ -145,6 +152,11 @@ export default function Home() {
       }
     })
 
+    newSocket.on('token', (data: TokenUpdate) => {
+      if (data.sessionId !== sessionIdRef.current) return
+      setBlogContent((prev: string) => prev + data.delta)
+    })
+
     return () => {
       newSocket.disconnect()
     }
@@ -166,6 +178,7 @@ export default function Home() {
     setProgress([])
     setBlogContent('')
     setCurrentStep('')
+    sessionIdRef.current = null
 
     try {
       const response = await fetch('http://localhost:3001/api/generate', {
@@ -178,6 +191,7 @@ export default function Home() {
           repoName,
           customPrompt: customPrompt || undefined,
           ignoreFiles: ignoreFiles || undefined,
+          socketId: socket?.id,
         }),
         mode: 'cors',
       })
@@ -188,6 +202,7 @@ export default function Home() {
       }
       
       const result = await response.json()
+      sessionIdRef.current = result.sessionId
       console.log('Generation started successfully:', result)
     } catch (error) {
       console.error('Generation error:', error)
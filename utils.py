@@ -1,21 +1,118 @@
 import os
+import re
+import signal
 import asyncio
+import hashlib
+import string
 import subprocess
 import tempfile
 import shutil
 from pathlib import Path
-from typing import Optional
+from typing import List, Optional
+
+
+# ASCII characters dropped by normalize_filename (spaces and underscores become hyphens first)
+_KEEP = set(string.ascii_lowercase + string.digits + '-')
+_TRANS = str.maketrans({c: None for c in map(chr, range(128)) if c not in _KEEP and c != ' ' and c != '_'})
+
+# Handle various GitHub URL formats
+_URL_PATTERNS = [
+    re.compile(r'github\.com/[^/]+/([^/\.]+)'),  # https://github.com/user/repo
+    re.compile(r'github\.com/([^/]+)/?$'),       # https://github.com/repo
+]
+
+# Command used to run repomix; ensure_repomix() swaps in the installed binary
+# when there is one, which skips npx's package resolution on every call
+REPOMIX_CMD: List[str] = ["npx", "repomix"]
+
+REPO_CACHE_DIR = Path("data/repos/cache")
+REPO_CACHE_MAX_ENTRIES = 50
+
+# Seconds to wait for `git ls-remote` before giving up on the cache
+LS_REMOTE_TIMEOUT = 15.0
+
+
+async def get_remote_head_sha(repo_url: str) -> Optional[str]:
+    """Get the commit SHA of a remote repository's HEAD, or None if unavailable"""
+    try:
+        # Never prompt for credentials (private or mistyped URLs would hang)
+        process = await asyncio.create_subprocess_exec(
+            "git", "ls-remote", repo_url, "HEAD",
+            stdout=asyncio.subprocess.PIPE,
+            stderr=asyncio.subprocess.PIPE,
+            stdin=asyncio.subprocess.DEVNULL,
+            env={**os.environ, "GIT_TERMINAL_PROMPT": "0"},
+            start_new_session=True
+        )
+    except Exception:
+        return None
+    try:
+        stdout, _ = await asyncio.wait_for(process.communicate(), timeout=LS_REMOTE_TIMEOUT)
+        if process.returncode != 0 or not stdout:
+            return None
+        return stdout.decode('utf-8').split()[0]
+    except asyncio.TimeoutError:
+        print(f"⚠️  git ls-remote timed out for {repo_url}, skipping repo cache")
+        return None
+    except Exception:
+        return None
+    finally:
+        # Timed out or cancelled: don't leave git running
+        if process.returncode is None:
+            await _kill_process(process)
+
+
+async def _kill_process(process: asyncio.subprocess.Process) -> None:
+    """Kill a child and anything it spawned, then reap it"""
+    try:
+        if hasattr(os, "killpg"):
+            # Kill the whole group, git's transport helpers hold the pipes open too
+            os.killpg(process.pid, signal.SIGKILL)
+        else:
+            process.kill()
+    except ProcessLookupError:
+        pass
+    await process.wait()
+
+
+def _store_in_repo_cache(output_path: Path, cache_path: Path) -> None:
+    """Copy a fresh dump into the cache and evict old entries"""
+    REPO_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    shutil.copy(output_path, cache_path)
+    _prune_repo_cache()
+
+
+def _prune_repo_cache() -> None:
+    """Keep only the newest REPO_CACHE_MAX_ENTRIES cached repository dumps"""
+    entries = sorted(REPO_CACHE_DIR.glob("*.md"), key=lambda p: p.stat().st_mtime, reverse=True)
+    for stale in entries[REPO_CACHE_MAX_ENTRIES:]:
+        stale.unlink(missing_ok=True)
 
 
 async def process_remote_repo(repo_url: str, output_path: Path, ignore_files: str = "") -> None:
     """
-    Process a remote GitHub repository using repomix
+    Process a remote GitHub repository using repomix.
+    
+    Output is cached per (repo_url, HEAD commit, ignore_files), so repeat runs
+    against an unchanged repository skip repomix entirely.
     """
     try:
         print(f"📦 Processing repository: {repo_url}")
         
+        # Reuse a previous dump if the repository hasn't changed
+        cache_path = None
+        sha = await get_remote_head_sha(repo_url)
+        if sha:
+            key = hashlib.sha256(f"{repo_url}|{sha}|{ignore_files}".encode('utf-8')).hexdigest()
+            cache_path = REPO_CACHE_DIR / f"{key}.md"
+            if cache_path.exists():
+                await asyncio.to_thread(shutil.copy, cache_path, output_path)
+                await asyncio.to_thread(cache_path.touch)  # Mark as recently used
+                print(f"⚡ Using cached repository dump for {sha[:7]}: {output_path}")
+                return
+        
         # Build repomix command
-        cmd = ["npx", "repomix", repo_url, "--output", str(output_path)]
+        cmd = [*REPOMIX_CMD, repo_url, "--output", str(output_path)]
         
         # Add ignore patterns if provided
         if ignore_files.strip():
@@ -42,6 +139,9 @@ async def process_remote_repo(repo_url: str, output_path: Path, ignore_files: st
         # Verify output file exists and has content
         if not output_path.exists() or output_path.stat().st_size == 0:
             raise Exception("Repository processing completed but output file is empty")
+        
+        if cache_path:
+            await asyncio.to_thread(_store_in_repo_cache, output_path, cache_path)
             
     except Exception as e:
         print(f"❌ Error processing repository: {e}")
@@ -50,27 +150,26 @@ async def process_remote_repo(repo_url: str, output_path: Path, ignore_files: st
 
 def normalize_filename(name: str) -> str:
     """Normalize filename by removing special characters and spaces"""
-    import re
     # Replace spaces and underscores with hyphens, remove special chars
-    normalized = re.sub(r'[^\w\-]', '', name.lower().replace(' ', '-').replace('_', '-'))
-    # Remove multiple consecutive hyphens
-    normalized = re.sub(r'-+', '-', normalized)
+    s = name.lower().replace(' ', '-').replace('_', '-').translate(_TRANS)
+    # Remove multiple consecutive hyphens (and non-ASCII symbols the table can't cover)
+    out = []
+    prev = ''
+    for c in s:
+        if c == '-' and prev == '-':
+            continue
+        if c > '\x7f' and not c.isalnum():
+            continue
+        out.append(c)
+        prev = c
     # Remove leading/trailing hyphens
-    return normalized.strip('-')
+    return ''.join(out).strip('-')
 
 
 def extract_repo_name_from_url(repo_url: str) -> str:
     """Extract repository name from GitHub URL"""
-    import re
-    
-    # Handle various GitHub URL formats
-    patterns = [
-        r'github\.com/[^/]+/([^/\.]+)',  # https://github.com/user/repo
-        r'github\.com/([^/]+)/?$',       # https://github.com/repo
-    ]
-    
-    for pattern in patterns:
-        match = re.search(pattern, repo_url)
+    for pattern in _URL_PATTERNS:
+        match = pattern.search(repo_url)
         if match:
             return match.group(1)
     
@@ -83,7 +182,7 @@ async def check_repomix_available() -> bool:
     """Check if repomix is available"""
     try:
         process = await asyncio.create_subprocess_exec(
-            "npx", "repomix", "--version",
+            *REPOMIX_CMD, "--version",
             stdout=asyncio.subprocess.PIPE,
             stderr=asyncio.subprocess.PIPE
         )
@@ -93,8 +192,17 @@ async def check_repomix_available() -> bool:
         return False
 
 
+def _resolve_repomix() -> None:
+    """Use the repomix binary directly if it's on PATH"""
+    global REPOMIX_CMD
+    repomix_path = shutil.which("repomix")
+    if repomix_path:
+        REPOMIX_CMD = [repomix_path]
+
+
 async def ensure_repomix() -> None:
-    """Ensure repomix is available"""
+    """Ensure repomix is available. Meant to be run once at startup."""
+    _resolve_repomix()
     if not await check_repomix_available():
         print("📦 Installing repomix...")
         process = await asyncio.create_subprocess_exec(
@@ -104,5 +212,6 @@ async def ensure_repomix() -> None:
         )
         await process.communicate()
         
+        _resolve_repomix()
         if not await check_repomix_available():
             raise Exception("Failed to install repomix. Please install it manually: npm install -g repomix")